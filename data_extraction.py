@@ -18,22 +18,302 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
+import asyncio
+import atexit
+import filecmp
+import inspect
 import json
-import time
+import os
+import re
+import sys
+import tempfile
+import types
+from collections import defaultdict
 from pathlib import Path
-from playwright.sync_api import sync_playwright, Page, TimeoutError, expect
+from typing import Sequence
+from urllib.parse import urlparse
+
+import playwright._impl._connection as _pw_connection
+
+# Older playwright-python releases call inspect.stack() on every API call to
+# record the caller's location, which dominates the driver's CPU time. Swap in
+# an inspect module whose stack() is empty. The trade-off: with no stack the
+# API name comes out empty, so every call is sent as internal and drops out of
+# traces and loses its name in call metadata. Set PW_INSPECT_STACK=1 to keep
+# the stack capture when tracing or debugging.
+if os.environ.get("PW_INSPECT_STACK", "0") != "1":
+    _inspect_without_stack = types.ModuleType("inspect")
+    _inspect_without_stack.__dict__.update(inspect.__dict__)
+    _inspect_without_stack.stack = lambda *args, **kwargs: []
+    _pw_connection.inspect = _inspect_without_stack
+
+from playwright.async_api import async_playwright, Error as PlaywrightError, Page, Route, TimeoutError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Resource types that are never needed to read the product data
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+# Analytics and tracking requests are aborted regardless of type
+BLOCKED_URL_PATTERN = re.compile(
+    r"googletagmanager\.com|google-analytics\.com|doubleclick\.net|segment\.(?:io|com)|hotjar\.com"
+)
+
+# Maximum number of concurrent runs against the same host
+PER_DOMAIN_CONCURRENCY = 2
+
+# Product extraction script, injected once per context so every page has
+# window.__extractProducts() defined instead of sending the source each call
+EXTRACT_JS = """
+(() => {
+    // Compiled once per page rather than on every card
+    const RE_PRICE = /\\$[\\d,]+\\.\\d{2}/, RE_NUM = /[\\d.]+/, RE_ID = /ID:\\s*(\\S+)/;
+
+    window.__extractProducts = () => {
+        // Products returned by earlier calls are skipped so only new ones
+        // cross the bridge back to Python. They are matched by id, not by
+        // element, since the grid may reuse nodes for new rows
+        const seenIds = window.__seenIds = window.__seenIds || new Set();
+        const products = [];
+        const cards = document.querySelectorAll('.grid > div');
+
+        cards.forEach(card => {
+            try {
+                const product = {};
+
+                // Extract name from the colored header
+                const nameDiv = card.querySelector('div.h-12');
+                if (nameDiv) {
+                    product.name = nameDiv.textContent.trim();
+                }
+
+                // Extract details from the p-3 container
+                const detailsContainer = card.querySelector('.p-3');
+                if (detailsContainer) {
+                    const detailDivs = detailsContainer.querySelectorAll('div.text-xs > div');
+
+                    detailDivs.forEach(div => {
+                        const text = div.textContent.trim();
+                        // The value sits in the last span; fall back to the row text
+                        const spans = div.querySelectorAll('span');
+                        const value = spans.length > 0 ? spans[spans.length - 1].textContent.trim() : text;
+
+                        if (text.startsWith('ID:')) {
+                            const idMatch = text.match(RE_ID);
+                            product.id = idMatch ? idMatch[1] : value;
+                        }
+                        else if (text.includes('Price')) {
+                            // Keep only the dollar amount
+                            const priceMatch = value.match(RE_PRICE);
+                            product.price = priceMatch ? priceMatch[0] : value.replace('Price', '').trim();
+                        }
+                        else if (text.includes('Mass (kg)')) {
+                            // Keep only the number
+                            const massMatch = value.replace('Mass (kg)', '').match(RE_NUM);
+                            product.mass_kg = massMatch ? massMatch[0] : value.replace('Mass (kg)', '').trim();
+                        }
+                        else if (text.includes('Score')) {
+                            // The score value usually has the ml-1 class
+                            const scoreSpan = div.querySelector('span.ml-1');
+                            const score = scoreSpan ? scoreSpan.textContent.trim() : value;
+                            const scoreMatch = score.replace('Score', '').match(RE_NUM);
+                            product.score = scoreMatch ? scoreMatch[0] : score.replace('Score', '').trim();
+                        }
+                    });
+                }
+
+                if (product.name && product.id && product.price && product.mass_kg && product.score) {
+                    if (!seenIds.has(product.id)) {
+                        seenIds.add(product.id);
+                        products.push(product);
+                    }
+                }
+            } catch (e) {
+                // Skip cards that fail to parse
+            }
+        });
+
+        return products;
+    };
+
+    // Number of rendered cards and the id of the last one; a windowed grid
+    // swaps rows in place, so a new last id also means new content
+    window.__gridState = () => {
+        const cards = document.querySelectorAll('.grid > div');
+        const last = cards[cards.length - 1];
+        let lastId = null;
+        if (last) {
+            for (const div of last.querySelectorAll('.p-3 div.text-xs > div')) {
+                const idMatch = div.textContent.trim().match(RE_ID);
+                if (idMatch) {
+                    lastId = idMatch[1];
+                    break;
+                }
+            }
+        }
+        return {count: cards.length, lastId: lastId};
+    };
+})();
+"""
+
+
+def _json_line(record) -> bytes:
+    """
+    Serialize a record as one JSON Lines entry
+    """
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _dumps_indented(data) -> bytes:
+    """
+    Serialize data as pretty-printed UTF-8 JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes):
+    """
+    Parse JSON from raw bytes
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+async def _launch_browser(playwright):
+    """
+    Launch Chromium with the options used for extraction
+    """
+    # Set DEBUG_HEADFUL=1 to watch the browser while debugging
+    return await playwright.chromium.launch(
+        headless=os.environ.get("DEBUG_HEADFUL") != "1",
+        args=["--disable-dev-shm-usage", "--no-sandbox"]
+    )
+
 
 class DataExtractor:
-    def __init__(self, url, session_file="session.json"):
+    # Browser shared by every extractor; launching Chromium is the most
+    # expensive step, so it is started once and reused across runs
+    _loop = None
+    _playwright = None
+    _browser = None
+
+    def __init__(self, url, session_file="session.json", browser=None, output_file="product_data.json",
+                 stream_file="product_data.jsonl"):
         self.url = url
         self.session_file = Path(session_file)
-        self.data = []
+        self.browser = browser
+        self.output_file = output_file
+        self.stream_file = stream_file
+        self._stream = None
+        self._cdp = None
+        # Products keyed by id, in extraction order
+        self.data = {}
         self.max_products = None
 
     def run(self, username=None, password=None, max_products=2505):
         """
         Main method to run the data extraction process
         """
+        loop = self._get_loop()
+        return loop.run_until_complete(self.run_async(username, password, max_products))
+
+    @classmethod
+    def run_many(cls, urls, username=None, password=None, max_products=2505, concurrency=8):
+        """
+        Run the extraction for several URLs concurrently on the shared browser
+
+        Each URL's result is its product list, or the exception its run raised.
+        """
+        async def run_all():
+            browser = await cls.get_browser()
+            return await extract_many(
+                urls, concurrency, browser, username=username, password=password, max_products=max_products
+            )
+
+        return cls._get_loop().run_until_complete(run_all())
+
+    @classmethod
+    async def get_browser(cls, playwright=None):
+        """
+        Return the shared browser, launching it on first use
+
+        Only valid on the class event loop used by run() and run_many(); the
+        cached objects would outlive any other loop.
+        """
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if cls._loop is None or running_loop is not cls._loop:
+            raise RuntimeError("The shared browser is only available on DataExtractor's own event loop")
+        if cls._browser is None or not cls._browser.is_connected():
+            if playwright is None:
+                if cls._playwright is None:
+                    cls._playwright = await async_playwright().start()
+                playwright = cls._playwright
+            cls._browser = await _launch_browser(playwright)
+        return cls._browser
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Close the shared browser and stop Playwright
+        """
+        if cls._loop is None or cls._loop.is_closed():
+            return
+
+        async def close():
+            if cls._browser is not None:
+                await cls._browser.close()
+            if cls._playwright is not None:
+                await cls._playwright.stop()
+
+        try:
+            cls._loop.run_until_complete(close())
+        finally:
+            cls._loop.close()
+            cls._loop = None
+            cls._playwright = None
+            cls._browser = None
+
+    @classmethod
+    def _get_loop(cls):
+        """
+        Return the event loop the shared browser lives on
+        """
+        # Playwright objects are bound to the loop that created them, so all
+        # synchronous entry points reuse one loop instead of asyncio.run()
+        if cls._loop is None or cls._loop.is_closed():
+            cls._loop = asyncio.new_event_loop()
+        return cls._loop
+
+    async def run_async(self, username=None, password=None, max_products=2505):
+        """
+        Run the data extraction process as a coroutine
+
+        An async Browser passed to the constructor is bound to the caller's
+        event loop, so such extractors must be driven through this coroutine
+        from that loop rather than through run(). Without one, a call made
+        outside run() launches its own browser and closes it before returning.
+        """
+        if self.browser is None and asyncio.get_running_loop() is not self._loop:
+            # The shared browser lives on the class loop; caching one here
+            # would leave it bound to a loop that closes after this call
+            async with async_playwright() as playwright:
+                self.browser = await _launch_browser(playwright)
+                try:
+                    return await self.run_async(username, password, max_products)
+                finally:
+                    await self.browser.close()
+                    self.browser = None
+
         self.max_products = max_products
         
         # Load credentials from config file if not provided
@@ -42,68 +322,126 @@ class DataExtractor:
             username = config.get("username", username)
             password = config.get("password", password)
         
-        with sync_playwright() as playwright:
-            # Launch browser in non-headless mode for debugging
-            browser = playwright.chromium.launch(headless=False)
-            context = None
-
-            # Try to load existing session if available
-            if self.session_file.exists():
-                print("Loading existing session...")
-                context = browser.new_context(storage_state=str(self.session_file))
-            else:
-                print("Creating new session...")
-                context = browser.new_context()
+        browser = self.browser or await self.get_browser()
+        context = await self._new_context(browser)
 
-            page = context.new_page()
+        try:
+            page = await context.new_page()
             # Set a reasonable default timeout
             page.set_default_timeout(30000)
+            # Raw CDP session for the extraction calls in the scroll loop
+            self._cdp = await context.new_cdp_session(page)
 
+            print(f"Navigating to {self.url}...")
+            # Return as soon as the response starts and wait only for what is needed
+            await page.goto(self.url, wait_until="commit", timeout=10000)
+            # Wait for either the login form or the app shell to render; the
+            # login check below does its own wait, so a miss here is not fatal
             try:
-                print(f"Navigating to {self.url}...")
-                page.goto(self.url)
-                # Wait for network to be idle
-                page.wait_for_load_state("networkidle")
-                
-                # Check if login is required
-                if self._is_login_required(page):
-                    print("Login required detected...")
-                    if not username or not password:
-                        raise ValueError("Login required but credentials not provided")
-                    self._login(page, username, password)
-                    # Save session state for future use
-                    context.storage_state(path=str(self.session_file))
-                    print("Login successful, session saved.")
-
-                # Navigate to challenge page
-                print("Navigating to challenge page...")
-                page.goto(f"{self.url.rstrip('/')}/challenge")
-                page.wait_for_load_state("networkidle")
-                time.sleep(2)
-                
-                # Navigate to products section
-                print("Navigating to products...")
-                self._navigate_to_products(page)
-                
-                # Extract product data
-                print("Extracting product data...")
-                self._extract_product_data(page)
-                
+                await page.locator("input[type='password']").or_(page.locator("nav, header, main")).first.wait_for(
+                    timeout=10000
+                )
+            except TimeoutError:
+                pass
+            
+            # Check if login is required
+            if await self._is_login_required(page):
+                print("Login required detected...")
+                if not username or not password:
+                    raise ValueError("Login required but credentials not provided")
+                await self._login(page, username, password)
+                # Save session state for future use
+                await self._save_session(context)
+                print("Login successful, session saved.")
+
+            # Navigate to challenge page
+            print("Navigating to challenge page...")
+            # The menu lookup below waits for the page to render
+            await page.goto(f"{self.url.rstrip('/')}/challenge", wait_until="commit", timeout=10000)
+            
+            # Navigate to products section
+            print("Navigating to products...")
+            await self._navigate_to_products(page)
+            
+            # Extract product data
+            print("Extracting product data...")
+            if self.stream_file:
+                # Write each product to disk as soon as it is extracted
+                self._stream = open(self.stream_file, "wb", buffering=1 << 16)
+            await self._extract_product_data(page)
+            
+            if self.output_file:
                 # Export data to JSON file
                 print(f"Exporting {len(self.data)} products to JSON...")
-                self._export_data("product_data.json")
+                self._export_data(self.output_file)
 
-                print(f"Successfully extracted {len(self.data)} products.")
+            print(f"Successfully extracted {len(self.data)} products.")
 
-            except Exception as e:
-                print(f"Error: {e}")
-                # Re-raise the exception for debugging
-                raise
-            finally:
-                # Ensure browser is closed even if an error occurs
-                browser.close()
+        except Exception as e:
+            print(f"Error: {e}")
+            # Re-raise the exception for debugging
+            raise
+        finally:
+            self._cdp = None
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+            # Close only this run's context; the browser is reused
+            await context.close()
+
+        return list(self.data.values())
+
+    async def _new_context(self, browser):
+        """
+        Create a browser context that skips resources the extraction does not need
+        """
+        # Try to load existing session if available
+        storage_state = None
+        if self.session_file.exists():
+            print("Loading existing session...")
+            storage_state = str(self.session_file)
+        else:
+            print("Creating new session...")
+
+        context = await browser.new_context(
+            storage_state=storage_state,
+            viewport={"width": 1280, "height": 720},
+            device_scale_factor=1
+        )
+        await context.route("**/*", self._block_unneeded_resources)
+        await context.add_init_script(script=EXTRACT_JS)
+        return context
+
+    @staticmethod
+    async def _block_unneeded_resources(route: Route) -> None:
+        """
+        Abort images, fonts, media and analytics requests before they hit the network
+        """
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_PATTERN.search(request.url):
+            await route.abort()
+        else:
+            await route.continue_()
 
-        return self.data
+    async def _save_session(self, context) -> None:
+        """
+        Save the context's storage state, replacing the session file atomically
+        """
+        # Write next to the session file so the final rename stays on one
+        # filesystem; a crash mid-write never leaves a truncated session
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.session_file.parent, prefix=self.session_file.name, suffix=".tmp"
+        )
+        os.close(fd)
+        try:
+            await context.storage_state(path=tmp_path)
+            # Keep the existing file if the session did not change
+            if self.session_file.exists() and filecmp.cmp(tmp_path, self.session_file, shallow=False):
+                return
+            os.replace(tmp_path, self.session_file)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
     def _load_config(self, config_file="config.json"):
         """
@@ -112,8 +450,7 @@ class DataExtractor:
         config_path = Path(config_file)
         if config_path.exists():
             try:
-                with open(config_path, "r") as f:
-                    return json.load(f)
+                return _loads(config_path.read_bytes())
             except json.JSONDecodeError:
                 print(f"Warning: {config_file} contains invalid JSON")
                 return {}
@@ -121,7 +458,7 @@ class DataExtractor:
             print(f"Warning: {config_file} not found")
             return {}
 
-    def _is_login_required(self, page: Page) -> bool:
+    async def _is_login_required(self, page: Page) -> bool:
         """
         Check if login is required by looking for login indicators
         """
@@ -133,287 +470,126 @@ class DataExtractor:
             "button:has-text('Sign In')"
         ]
 
-        # Check each selector with a short timeout
-        for selector in login_indicators:
-            try:
-                if page.locator(selector).first.is_visible(timeout=2000):
-                    print(f"Login indicator found: {selector}")
-                    return True
-            except:
-                continue
+        # Callers have already waited for the page to settle (the login-form
+        # or app-shell sentinel, or the form detaching), so check instantly
+        if await self._any_of(page, login_indicators).first.is_visible():
+            print("Login indicator found")
+            return True
         print("No login required")
         return False
 
-    def _login(self, page: Page, username: str, password: str) -> None:
+    async def _login(self, page: Page, username: str, password: str) -> None:
         """
         Perform login with provided credentials
         """
         print("Attempting login...")
         # Fill username field
-        page.fill("input[type='text'], input[type='email'], input[name='username']", username)
+        await page.fill("input[type='text'], input[type='email'], input[name='username']", username)
         # Fill password field
-        page.fill("input[type='password']", password)
+        await page.fill("input[type='password']", password)
         # Click login button
-        page.click("button:has-text('Login'), button:has-text('Sign In'), input[type='submit']")
-        # Wait for navigation to complete
-        page.wait_for_load_state("networkidle")
-        time.sleep(5)
+        await page.click("button:has-text('Login'), button:has-text('Sign In'), input[type='submit']")
+        # Wait for the login form to go away
+        try:
+            await page.locator("input[type='password']").wait_for(state="detached", timeout=10000)
+        except TimeoutError:
+            pass
         
         # Verify login was successful
-        if self._is_login_required(page):
+        if await self._is_login_required(page):
             raise Exception("Login failed - still seeing login form")
 
-    def _navigate_to_products(self, page: Page) -> None:
+    async def _navigate_to_products(self, page: Page) -> None:
         """
         Navigate through the menu to reach the products page
         """
+        # Each step waits for its own selector, so no fixed delay is needed
+        # after the previous click
         print("Looking for menu button...")
-        menu_selectors = [
+        await self._click_first_visible(page, "menu", [
             "button:has-text('Menu')",
             "[aria-label='Menu']",
             ".menu-button",
-            "button[class*='menu']",
+            "button[class*='menu']"
+        ], fallbacks=[
             "button:has(svg)",
             "button >> nth=0"
-        ]
-        
-        # Try each menu selector with smart waiting
-        for selector in menu_selectors:
-            try:
-                if self._wait_for_selector(page, selector, timeout=5000):
-                    print(f"Found menu: {selector}")
-                    page.locator(selector).first.click()
-                    break
-            except:
-                continue
-        
-        page.wait_for_load_state("networkidle")
-        time.sleep(2)
+        ])
         
         print("Looking for Data Management option...")
-        data_management_selectors = [
+        await self._click_first_visible(page, "Data Management", [
             "button:has-text('Data Management')",
-            "a:has-text('Data Management')",
+            "a:has-text('Data Management')"
+        ], fallbacks=[
             "[href*='data']",
             "[href*='management']",
             "div:has-text('Data Management')"
-        ]
-        
-        # Try each data management selector
-        for selector in data_management_selectors:
-            try:
-                if self._wait_for_selector(page, selector, timeout=5000):
-                    print(f"Found Data Management: {selector}")
-                    page.locator(selector).first.click()
-                    break
-            except:
-                continue
-        
-        page.wait_for_load_state("networkidle")
-        time.sleep(1)
+        ])
         
         print("Looking for Inventory option...")
-        inventory_selectors = [
+        await self._click_first_visible(page, "Inventory", [
             "button:has-text('Inventory')",
-            "a:has-text('Inventory')",
+            "a:has-text('Inventory')"
+        ], fallbacks=[
             "[href*='inventory']",
             "div:has-text('Inventory')"
-        ]
-        
-        # Try each inventory selector
-        for selector in inventory_selectors:
-            try:
-                if self._wait_for_selector(page, selector, timeout=5000):
-                    print(f"Found Inventory: {selector}")
-                    page.locator(selector).first.click()
-                    break
-            except:
-                continue
-        
-        page.wait_for_load_state("networkidle")
-        time.sleep(1)
+        ])
         
         print("Looking for View All Products option...")
-        view_all_selectors = [
+        await self._click_first_visible(page, "View All", [
             "button:has-text('View All Products')",
-            "a:has-text('View All Products')",
+            "a:has-text('View All Products')"
+        ], fallbacks=[
             "button:has-text('View All')",
             "a:has-text('View All')",
             "[href*='product']",
             "[href*='view']"
-        ]
-        
-        # Try each view all selector
-        for selector in view_all_selectors:
-            try:
-                if self._wait_for_selector(page, selector, timeout=10000):
-                    print(f"Found View All: {selector}")
-                    page.locator(selector).first.click()
-                    break
-            except:
-                continue
-        
-        page.wait_for_load_state("networkidle")
-        time.sleep(3)
+        ])
         
         print("Looking for Load Table button...")
-        load_table_selectors = [
+        await self._click_first_visible(page, "Load button", [
             "button:has-text('Load Product Table')",
             "button:has-text('Load Table')",
-            "button:has-text('Load Products')",
+            "button:has-text('Load Products')"
+        ], fallbacks=[
             "button:has-text('Load')",
             "button >> nth=0"
-        ]
-        
-        # Try each load table selector
-        for selector in load_table_selectors:
-            try:
-                if self._wait_for_selector(page, selector, timeout=10000):
-                    print(f"Found Load button: {selector}")
-                    page.locator(selector).first.click()
-                    break
-            except:
-                continue
-        
-        page.wait_for_load_state("networkidle")
-        time.sleep(5)
+        ])
 
-    def _wait_for_selector(self, page: Page, selector: str, timeout: int = 10000) -> bool:
+    async def _click_first_visible(self, page: Page, name: str, selectors: Sequence[str],
+                                   fallbacks: Sequence[str] = (), timeout: int = 10000) -> bool:
         """
-        Smart waiting for selector with multiple strategies
+        Click the first element matching any of the selectors
         """
+        locator = self._any_of(page, selectors).first
         try:
-            # Wait for selector to be visible
-            page.wait_for_selector(selector, state="visible", timeout=timeout)
-            return True
-        except TimeoutError:
-            # Try alternative approach - check if element exists
-            if page.locator(selector).count() > 0:
-                return True
-            return False
+            await locator.wait_for(state="visible", timeout=timeout)
+        except PlaywrightError:  # includes TimeoutError
+            # Broad selectors match unrelated elements, so they cannot join the
+            # combined wait and are only checked once the specific ones fail
+            for selector in fallbacks:
+                if await page.locator(selector).count() > 0:
+                    locator = page.locator(selector).first
+                    break
+            else:
+                print(f"Could not find {name}")
+                return False
 
-    
+        print(f"Found {name}")
+        await locator.click()
+        return True
+
+    @staticmethod
+    def _any_of(page: Page, selectors: Sequence[str]):
         """
-        Extract product data from the grid with pagination handling
+        Combine selectors into one locator that matches any of them
         """
-        print("Waiting for product grid to load...")
-        
-        # Wait for product cards to appear
-        try:
-            page.wait_for_selector(".grid > div", state="visible", timeout=20000)
-            print("Product grid found")
-        except TimeoutError:
-            print("Timeout waiting for product grid")
-            return
-        
-        # Use JavaScript to extract data more precisely
-        product_data_list = page.evaluate("""
-            () => {
-                const products = [];
-                const cards = document.querySelectorAll('.grid > div');
-                
-                cards.forEach(card => {
-                    try {
-                        const product = {};
-                        
-                        // Extract name from the colored header
-                        const nameDiv = card.querySelector('div.h-12');
-                        if (nameDiv) {
-                            product.name = nameDiv.textContent.trim();
-                        }
-                        
-                        // Extract details from the p-3 container
-                        const detailsContainer = card.querySelector('.p-3');
-                        if (detailsContainer) {
-                            const detailDivs = detailsContainer.querySelectorAll('div.text-xs > div');
-                            
-                            detailDivs.forEach(div => {
-                                const text = div.textContent.trim();
-                                
-                                if (text.startsWith('ID:')) {
-                                    // Get all spans and take the last one which should be the value
-                                    const spans = div.querySelectorAll('span');
-                                    if (spans.length > 0) {
-                                        product.id = spans[spans.length - 1].textContent.trim();
-                                    } else {
-                                        product.id = text.replace('ID:', '').trim();
-                                    }
-                                }
-                                else if (text.includes('Price')) {
-                                    // Look for the price value in spans
-                                    const spans = div.querySelectorAll('span');
-                                    if (spans.length > 0) {
-                                        product.price = spans[spans.length - 1].textContent.trim();
-                                    } else {
-                                        // Fallback: extract dollar amount
-                                        const priceMatch = text.match(/\\$[\\d,]+\\.[\\d]{2}/);
-                                        if (priceMatch) {
-                                            product.price = priceMatch[0];
-                                        }
-                                    }
-                                }
-                                else if (text.includes('Mass (kg)')) {
-                                    // Look for the mass value in spans
-                                    const spans = div.querySelectorAll('span');
-                                    if (spans.length > 0) {
-                                        product.mass_kg = spans[spans.length - 1].textContent.trim();
-                                    } else {
-                                        // Fallback: extract number
-                                        const massMatch = text.match(/[\\d.]+/);
-                                        if (massMatch) {
-                                            product.mass_kg = massMatch[0];
-                                        }
-                                    }
-                                }
-                                else if (text.includes('Score')) {
-                                    // Look for the score value in spans (usually has ml-1 class)
-                                    const scoreSpan = div.querySelector('span.ml-1');
-                                    if (scoreSpan) {
-                                        product.score = scoreSpan.textContent.trim();
-                                    } else {
-                                        const spans = div.querySelectorAll('span');
-                                        if (spans.length > 0) {
-                                            product.score = spans[spans.length - 1].textContent.trim();
-                                        } else {
-                                            // Fallback: extract number
-                                            const scoreMatch = text.match(/[\\d.]+/);
-                                            if (scoreMatch) {
-                                                product.score = scoreMatch[0];
-                                            }
-                                        }
-                                    }
-                                }
-                            });
-                        }
-                        
-                        if (product.name && product.id && product.price && product.mass_kg && product.score) {
-                            products.push(product);
-                        }
-                    } catch (e) {
-                        console.error('Error processing card:', e);
-                    }
-                });
-                
-                return products;
-            }
-        """)
-        
-        # Add extracted products to self.data
-        extracted_ids = set()
-        for product in product_data_list:
-            if (product["id"] not in extracted_ids and 
-                len(self.data) < (self.max_products or float('inf'))):
-                # Clean up the values
-                product["id"] = product["id"].split()[0] if " " in product["id"] else product["id"]
-                product["price"] = product["price"].split()[0] if " " in product["price"] else product["price"]
-                product["mass_kg"] = product["mass_kg"].split()[0] if " " in product["mass_kg"] else product["mass_kg"]
-                
-                self.data.append(product)
-                extracted_ids.add(product["id"])
-                print(f"Extracted product {len(self.data)}: {product['name']} (ID: {product['id']})")
-        
-        print(f"Extracted {len(self.data)} products via JavaScript")
-    def _extract_product_data(self, page: Page) -> None:
+        locator = page.locator(selectors[0])
+        for selector in selectors[1:]:
+            locator = locator.or_(page.locator(selector))
+        return locator
+
+    async def _extract_product_data(self, page: Page) -> None:
         """
         Extract product data from the grid with pagination handling
         """
@@ -421,15 +597,17 @@ class DataExtractor:
         
         # Wait for product cards to appear
         try:
-            page.wait_for_selector(".grid > div", state="visible", timeout=20000)
+            await page.wait_for_selector(".grid > div", state="visible", timeout=20000)
             print("Product grid found")
         except TimeoutError:
             print("Timeout waiting for product grid")
             return
         
+        # Start from an empty set of already returned products
+        await page.evaluate("() => { window.__seenIds = new Set(); }")
+
         # Initialize variables for scroll handling
-        last_height = page.evaluate("document.body.scrollHeight")
-        extracted_ids = set()
+        limit = self.max_products or sys.maxsize
         scroll_attempts = 0
         max_scroll_attempts = 1000  
         no_new_items_count = 0
@@ -439,13 +617,13 @@ class DataExtractor:
         
         # Continue scrolling until max attempts or no new products found
         while scroll_attempts < max_scroll_attempts and no_new_items_count < max_no_new_items:
-            if self.max_products and len(self.data) >= self.max_products:
+            if len(self.data) >= limit:
                 print(f"Reached maximum products limit: {self.max_products}")
                 break
                 
             # Extract products from current view
             current_batch_count = len(self.data)
-            self._extract_products_from_current_view(page, extracted_ids)
+            await self._extract_products_from_current_view(page, limit)
             new_items_in_batch = len(self.data) - current_batch_count
             
             print(f"Batch extracted: {new_items_in_batch} new products, total: {len(self.data)}")
@@ -458,26 +636,30 @@ class DataExtractor:
                 no_new_items_count = 0  # Reset counter if we found new items
             
             # Check if we've reached the product limit
-            if self.max_products and len(self.data) >= self.max_products:
+            if len(self.data) >= limit:
                 break
                 
             # Scroll to load more products
             print(f"Scrolling to load more products (attempt {scroll_attempts + 1}/{max_scroll_attempts})...")
-            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            time.sleep(2)  
+            previous_state = await page.evaluate(
+                "() => { window.scrollTo(0, document.body.scrollHeight); return window.__gridState(); }"
+            )
             
-            # Check if scrolling loaded new content
-            new_height = page.evaluate("document.body.scrollHeight")
-            if new_height == last_height:
-                scroll_attempts += 1
-                print(f"No new content after scroll. Scroll attempts: {scroll_attempts}/{max_scroll_attempts}")
-            else:
+            # Wait only as long as it takes for new cards to render
+            try:
+                await page.wait_for_function(
+                    """previous => {
+                        const state = window.__gridState();
+                        return state.count > previous.count || state.lastId !== previous.lastId;
+                    }""",
+                    arg=previous_state,
+                    timeout=5000
+                )
                 scroll_attempts = 0  # Reset scroll attempts if new content was loaded
-                last_height = new_height
                 print("New content loaded after scrolling")
-                
-            # Small delay to avoid overwhelming the page
-            time.sleep(1)
+            except TimeoutError:
+                scroll_attempts += 1
+                print(f"No new content after scroll. Scroll attempts: {scroll_attempts}/{max_scroll_attempts}")
         
         print(f"Scrolling completed. Total products extracted: {len(self.data)}")
         if scroll_attempts >= max_scroll_attempts:
@@ -485,145 +667,76 @@ class DataExtractor:
         if no_new_items_count >= max_no_new_items:
             print("No new items found for multiple iterations, stopping extraction")
 
-    def _extract_products_from_current_view(self, page: Page, extracted_ids: set) -> None:
+    async def _extract_products_from_current_view(self, page: Page, limit: int) -> None:
         """
         Extract products from the currently visible view
         """
     
-        product_data_list = page.evaluate("""
-            () => {
-                const products = [];
-                const cards = document.querySelectorAll('.grid > div');
-                
-                cards.forEach(card => {
-                    try {
-                        const product = {};
-                        
-                        // Extract name from the colored header
-                        const nameDiv = card.querySelector('div.h-12');
-                        if (nameDiv) {
-                            product.name = nameDiv.textContent.trim();
-                        }
-                        
-                        // Extract details from the p-3 container
-                        const detailsContainer = card.querySelector('.p-3');
-                        if (detailsContainer) {
-                            const detailDivs = detailsContainer.querySelectorAll('div.text-xs > div');
-                            
-                            detailDivs.forEach(div => {
-                                const text = div.textContent.trim();
-                                
-                                if (text.startsWith('ID:')) {
-                                    // Get all spans and take the last one which should be the value
-                                    const spans = div.querySelectorAll('span');
-                                    if (spans.length > 0) {
-                                        product.id = spans[spans.length - 1].textContent.trim();
-                                    } else {
-                                        product.id = text.replace('ID:', '').trim();
-                                    }
-                                }
-                                else if (text.includes('Price')) {
-                                    // Look for the price value in spans
-                                    const spans = div.querySelectorAll('span');
-                                    if (spans.length > 0) {
-                                        product.price = spans[spans.length - 1].textContent.trim();
-                                    } else {
-                                        // Fallback: extract dollar amount
-                                        const priceMatch = text.match(/\\$[\\d,]+\\.[\\d]{2}/);
-                                        if (priceMatch) {
-                                            product.price = priceMatch[0];
-                                        } else {
-                                            product.price = text.replace('Price', '').trim();
-                                        }
-                                    }
-                                }
-                                else if (text.includes('Mass (kg)')) {
-                                    // Look for the mass value in spans
-                                    const spans = div.querySelectorAll('span');
-                                    if (spans.length > 0) {
-                                        product.mass_kg = spans[spans.length - 1].textContent.trim();
-                                    } else {
-                                        // Fallback: extract number
-                                        const massMatch = text.match(/[\\d.]+/);
-                                        if (massMatch) {
-                                            product.mass_kg = massMatch[0];
-                                        } else {
-                                            product.mass_kg = text.replace('Mass (kg)', '').trim();
-                                        }
-                                    }
-                                }
-                                else if (text.includes('Score')) {
-                                    // Look for the score value in spans (usually has ml-1 class)
-                                    const scoreSpan = div.querySelector('span.ml-1');
-                                    if (scoreSpan) {
-                                        product.score = scoreSpan.textContent.trim();
-                                    } else {
-                                        const spans = div.querySelectorAll('span');
-                                        if (spans.length > 0) {
-                                            product.score = spans[spans.length - 1].textContent.trim();
-                                        } else {
-                                            // Fallback: extract number
-                                            const scoreMatch = text.match(/[\\d.]+/);
-                                            if (scoreMatch) {
-                                                product.score = scoreMatch[0];
-                                            } else {
-                                                product.score = text.replace('Score', '').trim();
-                                            }
-                                        }
-                                    }
-                                }
-                            });
-                        }
-                        
-                        if (product.name && product.id && product.price && product.mass_kg && product.score) {
-                            products.push(product);
-                        }
-                    } catch (e) {
-                        console.error('Error processing card:', e);
-                    }
-                });
-                
-                return products;
-            }
-        """)
+        # Call Runtime.evaluate directly, skipping Playwright's evaluate wrapper
+        result = await self._cdp.send("Runtime.evaluate", {
+            "expression": "window.__extractProducts()",
+            "returnByValue": True,
+            "awaitPromise": False
+        })
+        if "exceptionDetails" in result:
+            raise RuntimeError(f"Product extraction failed: {result['exceptionDetails'].get('text')}")
+        product_data_list = result["result"].get("value", [])
         
         # Add extracted products to self.data
         for product in product_data_list:
-            if (product["id"] not in extracted_ids and 
-                len(self.data) < (self.max_products or float('inf'))):
-                
-        
-                product["id"] = self._clean_value(product["id"])
-                product["price"] = self._clean_value(product["price"])
-                product["mass_kg"] = self._clean_value(product["mass_kg"])
-                product["score"] = self._clean_value(product["score"])
-                
-                self.data.append(product)
-                extracted_ids.add(product["id"])
+            if len(self.data) >= limit:
+                break
+            if product["id"] not in self.data:
+                self.data[product["id"]] = product
+                if self._stream is not None:
+                    self._stream.write(_json_line(product))
 
-    def _clean_value(self, value: str) -> str:
-        """
-        Clean extracted values by removing unwanted text and keeping only the relevant part
-        """
-        
-        if " " in value:
-            parts = value.split()
-            # Try to find the part that looks like a value (number, dollar amount, etc.)
-            for part in parts:
-                if any(char.isdigit() for char in part) or part.startswith('$'):
-                    return part
-            return parts[0]  # Fallback to first part
-        return value
-    
     def _export_data(self, filename: str) -> None:
         """
         Export extracted data to a JSON file
         """
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        Path(filename).write_bytes(_dumps_indented(list(self.data.values())))
         print(f"Data exported to {filename}")
 
 
+async def extract_many(urls, concurrency=8, browser=None, **kwargs):
+    """
+    Extract products from several URLs concurrently in one browser
+
+    Without a browser, one is launched for this call and closed before it
+    returns. Each URL's result is its product list, or the exception its run
+    raised, so one failing URL does not discard the others.
+    """
+    if browser is None:
+        async with async_playwright() as playwright:
+            browser = await _launch_browser(playwright)
+            try:
+                return await extract_many(urls, concurrency, browser, **kwargs)
+            finally:
+                await browser.close()
+
+    slots = asyncio.Semaphore(concurrency)
+    domain_slots = defaultdict(lambda: asyncio.Semaphore(PER_DOMAIN_CONCURRENCY))
+
+    async def extract_one(url):
+        # Take the per-domain slot first so runs queued behind a busy host
+        # do not hold global slots other hosts could use
+        async with domain_slots[urlparse(url).netloc], slots:
+            # Each URL gets its own context; results are returned rather than
+            # exported so concurrent runs do not overwrite the same file
+            extractor = DataExtractor(url, browser=browser, output_file=None, stream_file=None)
+            try:
+                return await extractor.run_async(**kwargs)
+            except Exception as e:
+                return e
+
+    return await asyncio.gather(*(extract_one(url) for url in urls))
+
+
+# Close the shared browser when the interpreter exits
+atexit.register(DataExtractor.shutdown)
+
+
 if __name__ == "__main__":
     # Configuration
     APP_URL = "https://hiring.idenhq.com/"